@@ -7,11 +7,17 @@ from urllib.parse import parse_qs, urlparse
 from dotenv import load_dotenv
 
 class TickTickAuth:
+    # .env only needs to be parsed once per process
+    _dotenv_loaded = False
+
     def __init__(self, client_id, client_secret):
         self.client_id = client_id
         self.client_secret = client_secret
         self.redirect_uri = "http://localhost:8000/callback"
         self.token_file = os.path.expanduser("~/.inkypi/ticktick_token.json")
+        self._session = requests.Session()
+        # (mtime, tokens) of the last token file read
+        self._tokens_cache = None
 
     def get_auth_url(self):
         return f"https://ticktick.com/oauth/authorize?client_id={self.client_id}&redirect_uri={self.redirect_uri}&response_type=code&scope=tasks:read"
@@ -26,16 +32,27 @@ class TickTickAuth:
             
         with open(self.token_file, 'w') as f:
             json.dump(token_data, f)
+        self._tokens_cache = None
         print("New TickTick access token saved")
 
     def load_tokens(self):
-        # First try to load from token file
-        if os.path.exists(self.token_file):
+        # First try to load from token file, reusing the parsed tokens until it changes
+        try:
+            mtime = os.stat(self.token_file).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None:
+            if self._tokens_cache and self._tokens_cache[0] == mtime:
+                return self._tokens_cache[1]
             with open(self.token_file, 'r') as f:
-                return json.load(f)
+                tokens = json.load(f)
+            self._tokens_cache = (mtime, tokens)
+            return tokens
         
         # If token file doesn't exist, try to load from .env
-        load_dotenv()
+        if not TickTickAuth._dotenv_loaded:
+            load_dotenv()
+            TickTickAuth._dotenv_loaded = True
         access_token = os.getenv('TICKTICK_ACCESS_TOKEN')
         if access_token:
             return {'access_token': access_token}
@@ -46,7 +63,7 @@ class TickTickAuth:
         if not refresh_token:
             return None
             
-        response = requests.post(
+        response = self._session.post(
             "https://ticktick.com/oauth/token",
             data={
                 "client_id": self.client_id,
@@ -112,7 +129,7 @@ def authenticate():
     
     if server.auth_code:
         # Exchange code for tokens
-        response = requests.post(
+        response = auth._session.post(
             "https://ticktick.com/oauth/token",
             data={
                 "client_id": client_id,
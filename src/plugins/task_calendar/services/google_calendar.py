@@ -3,7 +3,7 @@
 import os
 import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
 import pytz
@@ -28,19 +28,19 @@ class CalendarEvent:
 
     # Default colors for different calendars
     CALENDAR_COLORS = {
-        'primary': 'red',
-        'other_google': 'blue',
-        'events_available': 'purple',
-        'holidays': 'green',
-        'birthdays': 'orange',
-        'partiful': 'green',
-        'work': 'yellow',
+        'primary': (255, 0, 0),           # red
+        'other_google': (0, 0, 255),      # blue
+        'events_available': (128, 0, 128),  # purple
+        'holidays': (0, 128, 0),          # green
+        'birthdays': (255, 165, 0),       # orange
+        'partiful': (0, 128, 0),          # green
+        'work': (255, 255, 0),            # yellow
     }
 
     @property
-    def color(self) -> str:
-        """Get the color for this event based on its calendar."""
-        return self.CALENDAR_COLORS.get(self.calendar_name, 'blue')
+    def color(self) -> Tuple[int, int, int]:
+        """Get the RGB color for this event based on its calendar."""
+        return self.CALENDAR_COLORS.get(self.calendar_name, (0, 0, 255))
 
 
 class GoogleCalendar:
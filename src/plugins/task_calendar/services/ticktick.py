@@ -1,17 +1,28 @@
+import os
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import requests
+from requests.adapters import HTTPAdapter
 import pytz
+from dotenv import load_dotenv
+
+from ..auth.ticktick_auth import TickTickAuth
 
 logger = logging.getLogger(__name__)
 
 # Constants
 TICKTICK_API_BASE_URL = "https://api.ticktick.com/open/v1"
 TICKTICK_INBOX_PROJECT_ID = "inbox124950952"
+MAX_FETCH_WORKERS = 8
+FETCH_MAX_WAIT_SECONDS = 15
 DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.%f%z'
 
+class TickTickAuthError(RuntimeError):
+    """Raised when the TickTick API rejects the access token."""
+
 @dataclass
 class TickTickTask:
     """Represents a TickTick task with standardized fields."""
@@ -25,19 +36,29 @@ class TickTickTask:
     
     # Priority colors for tasks
     PRIORITY_COLORS = {
-        0: 'blue',   # Normal
-        1: 'black',  # Low
-        2: 'orange', # Medium
-        3: 'pink'    # High
+        0: (0, 0, 255),     # Normal - blue
+        1: (0, 0, 0),       # Low - black
+        2: (255, 165, 0),   # Medium - orange
+        3: (255, 192, 203)  # High - pink
     }
     
     @property
-    def color(self) -> str:
-        """Get the color for this task based on its priority."""
-        return self.PRIORITY_COLORS.get(self.priority, 'blue')
+    def color(self) -> Tuple[int, int, int]:
+        """Get the RGB color for this task based on its priority."""
+        return self.PRIORITY_COLORS.get(self.priority, (0, 0, 255))
 
 class TickTick:
     """A class to interact with the TickTick API and manage tasks."""
+
+    def __init__(self):
+        # Keep connections alive across requests, one per concurrent project fetch
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(pool_maxsize=MAX_FETCH_WORKERS))
+        self._device_tz_name: Optional[str] = None
+        self._device_tz: Optional[pytz.BaseTzInfo] = None
+        self._auth: Optional[TickTickAuth] = None
+        # Configured token that was rejected, and the token refreshed in its place
+        self._refreshed_token: Optional[Tuple[str, str]] = None
     
     def get_tasks(self, device_config: Any) -> List[TickTickTask]:
         """
@@ -52,15 +73,17 @@ class TickTick:
         Raises:
             RuntimeError: If API key is not configured or token is invalid
         """
-        access_token = device_config.load_env_key("TICKTICK_ACCESS_TOKEN")
-        if not access_token:
+        configured_token = device_config.load_env_key("TICKTICK_ACCESS_TOKEN")
+        if not configured_token:
             raise RuntimeError("TICKTICK API Key not configured.")
      
-        if not self._test_token(access_token):
-            raise RuntimeError("Invalid access token.")
+        # Keep using a refreshed token until the configured one changes
+        access_token = configured_token
+        if self._refreshed_token and self._refreshed_token[0] == configured_token:
+            access_token = self._refreshed_token[1]
 
         # Calculate week start (Sunday) and end (Saturday) in EST
-        device_tz = pytz.timezone(device_config.get_config("timezone", "US/Eastern"))
+        device_tz = self._get_device_tz(device_config)
         now = datetime.now(device_tz)
         # weekday() returns 0-6 where 0 is Monday, so we need to adjust for Sunday start
         days_since_sunday = (now.weekday() + 1) % 7  # +1 to shift Monday=0 to Sunday=0
@@ -74,14 +97,83 @@ class TickTick:
             'Content-Type': 'application/json'
         }
         
+        project_ids = self._get_project_ids(device_config)
         try:
-            response = requests.get(
-                f'{TICKTICK_API_BASE_URL}/project/{TICKTICK_INBOX_PROJECT_ID}/data',
-                headers=headers
+            tasks = self._fetch_projects_tasks(project_ids, headers)
+        except TickTickAuthError:
+            # Refresh a rejected token and retry once instead of validating it up front
+            logger.warning("TickTick rejected the access token, refreshing it")
+            new_token = self._refresh_access_token()
+            if not new_token:
+                raise RuntimeError("Invalid access token.")
+            self._refreshed_token = (configured_token, new_token)
+            headers['Authorization'] = f'Bearer {new_token}'
+            tasks = self._fetch_projects_tasks(project_ids, headers)
+        logger.info(f"Retrieved {len(tasks)} tasks from TickTick API")
+        
+        calendar_tasks = self._organize_tasks_for_calendar(tasks, week_start, device_tz)
+        logger.info(f"Processed {len(calendar_tasks)} tasks for calendar display")
+        
+        for task in calendar_tasks:
+            logger.info(f"Task: {task.title} - Start: {task.start} - End: {task.end} - All Day: {task.is_all_day}")
+        
+        return calendar_tasks
+
+    def _get_device_tz(self, device_config: Any) -> pytz.BaseTzInfo:
+        """
+        Get the device timezone, resolving it again only when the setting changes.
+
+        Args:
+            device_config: Configuration object containing the timezone setting
+
+        Returns:
+            pytz.BaseTzInfo: The device timezone
+        """
+        tz_name = device_config.get_config("timezone", "US/Eastern")
+        if tz_name != self._device_tz_name:
+            self._device_tz = pytz.timezone(tz_name)
+            self._device_tz_name = tz_name
+        return self._device_tz
+
+    def _get_project_ids(self, device_config: Any) -> List[str]:
+        """
+        Get the TickTick project IDs to fetch tasks from.
+
+        Args:
+            device_config: Configuration object containing environment variables
+
+        Returns:
+            List[str]: Project IDs from TICKTICK_PROJECT_IDS, or the inbox if unset
+        """
+        project_ids = device_config.load_env_key("TICKTICK_PROJECT_IDS") or ''
+        project_ids = [project_id.strip() for project_id in project_ids.split(',') if project_id.strip()]
+        return project_ids or [TICKTICK_INBOX_PROJECT_ID]
+
+    def _fetch_project_tasks(self, project_id: str, headers: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        Fetch the raw tasks of a single TickTick project.
+
+        Args:
+            project_id (str): The project to fetch
+            headers (Dict[str, str]): Request headers including authorization
+
+        Returns:
+            List[Dict[str, Any]]: Raw tasks from the API
+
+        Raises:
+            RuntimeError: If the request fails or the response is malformed
+        """
+        try:
+            response = self._session.get(
+                f'{TICKTICK_API_BASE_URL}/project/{project_id}/data',
+                headers=headers,
+                timeout=FETCH_MAX_WAIT_SECONDS
             )
+            if response.status_code == 401:
+                raise TickTickAuthError("Invalid access token.")
             response.raise_for_status()
         except requests.RequestException as e:
-            logger.error(f"Failed to fetch tasks: {str(e)}")
+            logger.error(f"Failed to fetch tasks for project {project_id}: {str(e)}")
             raise RuntimeError(f"Failed to fetch tasks: {str(e)}")
 
         data = response.json()
@@ -89,45 +181,84 @@ class TickTick:
             logger.error("Invalid API response format: missing 'tasks' field")
             raise RuntimeError("Invalid API response format: missing 'tasks' field")
 
-        tasks = data['tasks']
-        logger.info(f"Retrieved {len(tasks)} tasks from TickTick API")
-        
-        calendar_tasks = self._organize_tasks_for_calendar(tasks, week_start, device_config)
-        logger.info(f"Processed {len(calendar_tasks)} tasks for calendar display")
-        
-        for task in calendar_tasks:
-            logger.info(f"Task: {task.title} - Start: {task.start} - End: {task.end} - All Day: {task.is_all_day}")
-        
-        return calendar_tasks
+        return data['tasks']
 
-    def _test_token(self, access_token: str) -> bool:
+    def _fetch_projects_tasks(self, project_ids: List[str], headers: Dict[str, str]) -> List[Dict[str, Any]]:
         """
-        Test if the access token is valid.
-        
+        Fetch raw tasks from several projects concurrently and merge them.
+
+        Projects that fail or do not answer within FETCH_MAX_WAIT_SECONDS are
+        skipped so the calendar still renders with partial results.
+
         Args:
-            access_token (str): The access token to test
-            
+            project_ids (List[str]): Projects to fetch
+            headers (Dict[str, str]): Request headers including authorization
+
         Returns:
-            bool: True if token is valid, False otherwise
+            List[Dict[str, Any]]: Raw tasks from all projects that responded
+
+        Raises:
+            RuntimeError: If no project could be fetched
         """
-        headers = {
-            'Authorization': f'Bearer {access_token}',
-            'Content-Type': 'application/json'
-        }
-        
+        if len(project_ids) == 1:
+            return self._fetch_project_tasks(project_ids[0], headers)
+
+        executor = ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(project_ids)))
         try:
-            response = requests.get(f'{TICKTICK_API_BASE_URL}/project', headers=headers)
-            response.raise_for_status()
-            return True
+            futures = {
+                executor.submit(self._fetch_project_tasks, project_id, headers): project_id
+                for project_id in project_ids
+            }
+            done, not_done = wait(futures, timeout=FETCH_MAX_WAIT_SECONDS)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in not_done:
+            logger.warning(f"Timed out fetching tasks for project {futures[future]}")
+
+        tasks = []
+        errors = []
+        for future in done:
+            try:
+                tasks.extend(future.result())
+            except RuntimeError as e:
+                errors.append(e)
+
+        if errors and len(errors) == len(project_ids):
+            raise errors[0]
+        if not done:
+            raise RuntimeError("Timed out fetching tasks from TickTick")
+
+        return tasks
+
+    def _refresh_access_token(self) -> Optional[str]:
+        """
+        Refresh the access token with the saved TickTick refresh token.
+
+        Returns:
+            Optional[str]: The new access token, or None if it could not be refreshed
+        """
+        if not self._auth:
+            load_dotenv()
+            client_id = os.getenv('TICKTICK_CLIENT_ID')
+            client_secret = os.getenv('TICKTICK_CLIENT_SECRET')
+            if not client_id or not client_secret:
+                logger.error("TICKTICK_CLIENT_ID and TICKTICK_CLIENT_SECRET must be set to refresh the token")
+                return None
+            self._auth = TickTickAuth(client_id, client_secret)
+
+        tokens = self._auth.load_tokens() or {}
+        try:
+            return self._auth.refresh_access_token(tokens.get('refresh_token'))
         except requests.RequestException as e:
-            logger.error(f"Token validation failed: {str(e)}")
-            return False
+            logger.error(f"Token refresh failed: {str(e)}")
+            return None
     
     def _organize_tasks_for_calendar(
         self, 
         tasks: List[Dict[str, Any]], 
         week_start: datetime,
-        device_config: Any
+        device_tz: pytz.BaseTzInfo
     ) -> List[TickTickTask]:
         """
         Organize tasks for calendar rendering, extracting start/end times and all-day status.
@@ -135,17 +266,26 @@ class TickTick:
         Args:
             tasks (List[Dict[str, Any]]): List of tasks from the API
             week_start (datetime): Start of the current week
-            device_config: Configuration object containing environment variables
+            device_tz (pytz.BaseTzInfo): Timezone to display tasks in
             
         Returns:
             List[TickTickTask]: List of tasks with start/end times and other metadata
         """
         calendar_tasks = []
         week_end = week_start + timedelta(days=6)
+
+        # API dates are in UTC, so widen the string window by a day on each side
+        # to never drop a task whose local date still falls within the week
+        window_start_prefix = (week_start - timedelta(days=1)).strftime('%Y-%m-%d')
+        window_end_prefix = (week_end + timedelta(days=1)).strftime('%Y-%m-%d')
+        week_start_date = week_start.date()
+        week_end_date = week_end.date()
         
         for task in tasks:
             try:
-                processed_task = self._process_single_task(task, week_start, week_end, device_config)
+                processed_task = self._process_single_task(
+                    task, week_start_date, week_end_date, window_start_prefix, window_end_prefix, device_tz
+                )
                 if processed_task:
                     calendar_tasks.append(processed_task)
             except Exception as e:
@@ -157,18 +297,22 @@ class TickTick:
     def _process_single_task(
         self, 
         task: Dict[str, Any], 
-        week_start: datetime, 
-        week_end: datetime,
-        device_config: Any
+        week_start_date: date, 
+        week_end_date: date,
+        window_start_prefix: str,
+        window_end_prefix: str,
+        device_tz: pytz.BaseTzInfo
     ) -> Optional[TickTickTask]:
         """
         Process a single task and convert it to calendar format.
         
         Args:
             task (Dict[str, Any]): The task to process
-            week_start (datetime): Start of the current week
-            week_end (datetime): End of the current week
-            device_config: Configuration object containing environment variables
+            week_start_date (date): First day of the current week
+            week_end_date (date): Last day of the current week
+            window_start_prefix (str): Earliest 'YYYY-MM-DD' date string worth parsing
+            window_end_prefix (str): Latest 'YYYY-MM-DD' date string worth parsing
+            device_tz (pytz.BaseTzInfo): Timezone to display the task in
             
         Returns:
             Optional[TickTickTask]: Processed task or None if task should be skipped
@@ -180,18 +324,21 @@ class TickTick:
         # Use startDate if available, else dueDate
         start_str = task.get('startDate') or task.get('dueDate')
         end_str = task.get('dueDate') or task.get('startDate')
+
+        # ISO-8601 dates compare lexicographically, so skip far-away tasks before parsing
+        if end_str[:10] < window_start_prefix or start_str[:10] > window_end_prefix:
+            return None
         
         try:
-            start_dt = datetime.strptime(start_str, DATE_FORMAT)
-            end_dt = datetime.strptime(end_str, DATE_FORMAT)
+            start_dt = self._parse_datetime(start_str)
+            end_dt = self._parse_datetime(end_str)
             
             # Convert to EST
-            device_tz = pytz.timezone(device_config.get_config("timezone", "US/Eastern"))
             start_dt = start_dt.astimezone(device_tz)
             end_dt = end_dt.astimezone(device_tz)
             
             # Only include tasks that overlap with this week
-            if end_dt.date() < week_start.date() or start_dt.date() > week_end.date():
+            if end_dt.date() < week_start_date or start_dt.date() > week_end_date:
                 return None
                 
             return TickTickTask(
@@ -205,3 +352,27 @@ class TickTick:
         except (ValueError, TypeError) as e:
             logger.warning(f"Failed to parse dates for task {task.get('title', 'Unknown')}: {str(e)}")
             return None
+
+    def _parse_datetime(self, value: str) -> datetime:
+        """
+        Parse an API timestamp such as '2024-01-01T05:00:00.000+0000'.
+
+        fromisoformat is much faster than strptime, but only accepts the
+        '+0000' offset form from Python 3.11 on, so fall back to DATE_FORMAT.
+
+        Args:
+            value (str): Timestamp from the API
+
+        Returns:
+            datetime: Timezone-aware datetime
+
+        Raises:
+            ValueError: If the timestamp matches neither format
+        """
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if parsed.tzinfo is not None:
+                return parsed
+        except ValueError:
+            pass
+        return datetime.strptime(value, DATE_FORMAT)
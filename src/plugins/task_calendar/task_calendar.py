@@ -1,15 +1,24 @@
 from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image, ImageDraw
+import io
 import logging
-from typing import Dict, Any, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
 from plugins.task_calendar.services.ticktick import TickTick
 from plugins.task_calendar.services.google_calendar import GoogleCalendar
 from .ui.renderer import CalendarRenderer
-from .ui.layout import calculate_calendar_dimensions
-from .ui.styles import CALENDAR_WIDTH_RATIO
+from .ui.layout import (
+    RenderContext, calculate_calendar_dimensions, calculate_week_days, create_render_context
+)
+from .ui.styles import CALENDAR_WIDTH_RATIO, WHITE
 
 logger = logging.getLogger(__name__)
 
+# Prefer tmpfs for debug dumps so they don't wear the SD card
+DEBUG_IMAGE_PATH = '/dev/shm/calendar.png' if os.path.isdir('/dev/shm') else '/tmp/calendar.png'
+MAX_STRUCTURE_CACHE_SIZE = 2
+
 class CalendarError(Exception):
     """Base exception for calendar-related errors."""
     pass
@@ -27,7 +36,9 @@ class TaskCalendar(BasePlugin):
         super().__init__(plugin_config)
         self._ticktick: Optional[TickTick] = None
         self._google_calendar: Optional[GoogleCalendar] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._renderer = CalendarRenderer()
+        self._structure_cache: Dict[Tuple[int, int, int], Image.Image] = {}
 
     def generate_image(self, settings: Dict[str, Any], device_config: Any) -> Image.Image:
         """
@@ -47,9 +58,17 @@ class TaskCalendar(BasePlugin):
             # Initialize services
             self._initialize_services()
 
-            # Get tasks and events
-            tasks = self._ticktick.get_tasks(device_config)
-            events = self._google_calendar.get_events(device_config)
+            # Get tasks and events concurrently, they are independent network calls
+            tasks_future = self._executor.submit(self._ticktick.get_tasks, device_config)
+            events_future = self._executor.submit(self._google_calendar.get_events, device_config)
+            try:
+                tasks = tasks_future.result()
+            except Exception as e:
+                raise CalendarError(f"Failed to fetch TickTick tasks: {str(e)}")
+            try:
+                events = events_future.result()
+            except Exception as e:
+                raise CalendarError(f"Failed to fetch Google Calendar events: {str(e)}")
             all_items = tasks + events
 
             # Setup image dimensions with defaults
@@ -61,30 +80,123 @@ class TaskCalendar(BasePlugin):
                 display_width, display_height, CALENDAR_WIDTH_RATIO
             )
             
-            # Create image and drawing context
-            image = Image.new('RGB', (display_width, display_height), 'white')
-            draw = ImageDraw.Draw(image)
+            # Resolve the render time once for every drawing helper
+            ctx = create_render_context()
 
-            # Draw calendar structure
-            self._renderer.draw_calendar_structure(draw, x_offset, day_width, height)
+            # Start from the calendar structure, which only changes once a day
+            image = self._get_structure_image(
+                display_width, display_height, x_offset, day_width, height, ctx
+            ).copy()
+            draw = ImageDraw.Draw(image)
             
             # Draw items
-            self._renderer.draw_calendar_items(draw, all_items, x_offset, day_width)
+            self._renderer.draw_calendar_items(
+                image, draw, all_items, x_offset, day_width, ctx
+            )
 
             # Draw timestamp
-            self._renderer.draw_timestamp(draw, display_width, display_height)
+            self._renderer.draw_timestamp(draw, display_width, display_height, ctx.now)
+
+            # Only dump the image for debugging, PNG encoding is costly on a Pi
+            debug_dump_path = self._get_debug_dump_path()
+            if debug_dump_path:
+                image.save(debug_dump_path, compress_level=1)
 
-            # Save and return image
-            image.save('/tmp/calendar.png')
             return image
 
         except Exception as e:
             logger.error(f"Error generating calendar image: {e}")
             raise CalendarError(f"Failed to generate calendar image: {str(e)}")
 
+    def generate_image_raw(self, settings: Dict[str, Any], device_config: Any) -> bytes:
+        """
+        Generate the calendar image as raw RGB pixel bytes, skipping any encoding.
+
+        Args:
+            settings: Plugin settings
+            device_config: Device configuration
+
+        Returns:
+            bytes: Row-major RGB pixels of the generated image
+        """
+        return self.generate_image(settings, device_config).tobytes()
+
+    def generate_image_bytes(self, settings: Dict[str, Any], device_config: Any, 
+                             image_format: str = 'BMP') -> bytes:
+        """
+        Generate the calendar image serialized into an in-memory buffer.
+
+        BMP and PPM are written without compression; request PNG only for debug dumps.
+
+        Args:
+            settings: Plugin settings
+            device_config: Device configuration
+            image_format: Pillow format name to serialize to
+
+        Returns:
+            bytes: The encoded image
+        """
+        buffer = io.BytesIO()
+        self.generate_image(settings, device_config).save(buffer, format=image_format)
+        return buffer.getvalue()
+
+    def _get_structure_image(
+        self,
+        display_width: int,
+        display_height: int,
+        x_offset: int,
+        day_width: int,
+        height: int,
+        ctx: RenderContext
+    ) -> Image.Image:
+        """
+        Get the headers and grid for today, drawing them only on a cache miss.
+
+        Args:
+            display_width: Display width in pixels
+            display_height: Display height in pixels
+            x_offset: Left offset of the calendar
+            day_width: Width of a day column
+            height: Calendar height
+            ctx: Render context of the current render
+
+        Returns:
+            PIL.Image: Cached structure image, which must be copied before drawing on it
+        """
+        key = (display_width, display_height, ctx.today_ord)
+        structure = self._structure_cache.get(key)
+        if structure is None:
+            structure = Image.new('RGB', (display_width, display_height), WHITE)
+            days = calculate_week_days(ctx, x_offset, day_width)
+            self._renderer.draw_calendar_structure(
+                structure, ImageDraw.Draw(structure), days, day_width, height
+            )
+
+            # Bound memory by evicting the oldest entries, dicts keep insertion order
+            while len(self._structure_cache) >= MAX_STRUCTURE_CACHE_SIZE:
+                del self._structure_cache[next(iter(self._structure_cache))]
+            self._structure_cache[key] = structure
+
+        return structure
+
+    def _get_debug_dump_path(self) -> Optional[str]:
+        """
+        Get the path to dump rendered images to, if debugging is enabled.
+
+        Returns:
+            The 'debug_dump_path' from the plugin config, DEBUG_IMAGE_PATH when
+            INKYPI_DEBUG_SAVE is set, or None to skip the dump
+        """
+        debug_dump_path = self.config.get('debug_dump_path') if self.config else None
+        if debug_dump_path:
+            return debug_dump_path
+        return DEBUG_IMAGE_PATH if os.getenv('INKYPI_DEBUG_SAVE') else None
+
     def _initialize_services(self) -> None:
         """Initialize calendar services if not already initialized."""
         if self._ticktick is None:
             self._ticktick = TickTick()
         if self._google_calendar is None:
-            self._google_calendar = GoogleCalendar() 
+            self._google_calendar = GoogleCalendar()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=2) 
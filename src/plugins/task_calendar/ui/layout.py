@@ -1,57 +1,144 @@
 """Calendar layout calculations and positioning."""
 
-from datetime import datetime, timedelta
-from typing import Dict, Any, Tuple, Union
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Union
+import numpy as np
 from ..services.google_calendar import CalendarEvent
 from ..services.ticktick import TickTickTask
-from .styles import MAX_TIMED_TITLE_LENGTH, LINE_HEIGHT
+from .styles import HEADER_HEIGHT, TASK_HEIGHT, PADDING
 
-def calculate_week_start() -> datetime:
-    """Calculate the start of the current week (Sunday)."""
-    today = datetime.now()
+MICROSECOND = timedelta(microseconds=1)
+HALF_HOUR_MICROSECONDS = 30 * 60 * 1_000_000
+THREE_HOURS_MICROSECONDS = 3 * 60 * 60 * 1_000_000
+DAY_MICROSECONDS = 24 * 60 * 60 * 1_000_000
+
+class DayColumn(NamedTuple):
+    """Header data for one day column of the week."""
+    x: int
+    name: str
+    number: str
+    date: date
+    is_today: bool
+
+@dataclass(frozen=True)
+class RenderContext:
+    """Render time and the week it falls in, resolved once per render."""
+    now: datetime
+    week_start: datetime
+    week_start_ord: int
+    today_ord: int
+
+def calculate_week_start(today: Optional[datetime] = None) -> datetime:
+    """Calculate the start of the week (Sunday) containing today, defaulting to now."""
+    if today is None:
+        today = datetime.now()
     days_to_sunday = (today.weekday() + 1) % 7
     return today - timedelta(days=days_to_sunday)
 
-def calculate_day_index(date: datetime, week_start: datetime) -> int:
-    """Calculate the day index (0-6) for a given date."""
-    return (date.date() - week_start.date()).days
+def create_render_context(now: Optional[datetime] = None) -> RenderContext:
+    """Resolve the render time and its week once, defaulting to now."""
+    if now is None:
+        now = datetime.now()
+    week_start = calculate_week_start(now)
+    return RenderContext(
+        now=now,
+        week_start=week_start,
+        week_start_ord=week_start.toordinal(),
+        today_ord=now.toordinal()
+    )
 
-def calculate_item_height(item: Union[CalendarEvent, TickTickTask], base_height: int) -> int:
+def calculate_week_days(ctx: RenderContext, x_offset: int, day_width: int) -> List[DayColumn]:
     """
-    Calculate the height of an item based on its duration and text content.
-    
+    Precompute the position, labels and today flag of each day in the week.
+
     Args:
-        item: Calendar item (either CalendarEvent or TickTickTask)
-        base_height: Base height for a standard item
-        
+        ctx: Render context of the current render
+        x_offset: Left offset of the calendar
+        day_width: Width of a day column
+
     Returns:
-        Height in pixels
+        One DayColumn per day, Sunday first
     """
-    if item.is_all_day:
-        return base_height
-        
-    # Calculate duration in minutes
-    try:
-        duration = item.end - item.start
-        duration_minutes = duration.total_seconds() / 60
-    except (TypeError, AttributeError):
-        # If duration can't be calculated, use minimum height
-        return base_height
-        
-    # Round up to nearest 30 minutes, with a minimum of 30 minutes
-    duration_blocks = max(1, (duration_minutes + 29) // 30)
-    
-    # Calculate height based on duration
-    duration_height = int(base_height * duration_blocks)
-    
-    # Add extra height for text wrapping if needed
-    # Estimate number of lines based on title length
-    title_length = len(item.title)
-    if title_length > MAX_TIMED_TITLE_LENGTH:
-        extra_lines = (title_length - MAX_TIMED_TITLE_LENGTH) // 20  # Approximate characters per line
-        duration_height += extra_lines * LINE_HEIGHT
-    
-    return duration_height
+    days = []
+    for i in range(7):
+        day = ctx.week_start + timedelta(days=i)
+        days.append(DayColumn(
+            x=x_offset + i * day_width,
+            name=day.strftime('%a'),
+            number=day.strftime('%d'),
+            date=day.date(),
+            is_today=ctx.week_start_ord + i == ctx.today_ord
+        ))
+    return days
+
+def truncate_title(title: str, max_length: int) -> str:
+    """Truncate a title to max_length, slicing only when it is too long."""
+    return title if len(title) <= max_length else title[:max_length]
+
+def layout_calendar_items(items: List[Union[CalendarEvent, TickTickTask]], 
+                          week_start_ord: int, x_offset: int, day_width: int
+                          ) -> List[Tuple[Union[CalendarEvent, TickTickTask], int, int, int]]:
+    """
+    Position items in the week grid, all-day items first then by start time in each day.
+
+    An item is repeated on every day it covers, i.e. its start date plus each
+    whole day that fits before its end. All coordinate math runs on numpy
+    arrays so the caller's loop only has to issue the drawing calls.
+
+    Args:
+        items: Calendar items (CalendarEvent or TickTickTask)
+        week_start_ord: Date ordinal of the start of the current week
+        x_offset: Left offset of the calendar
+        day_width: Width of a day column
+
+    Returns:
+        (item, x, y, height) for every box to draw, in drawing order
+    """
+    count = len(items)
+    if not count:
+        return []
+
+    # Day index of each item's start, from its wall-clock date ordinal
+    start_idx = np.fromiter((item.start.toordinal() for item in items), dtype=np.int64, count=count)
+    start_idx -= week_start_ord
+    start_ts = np.fromiter((item.start.timestamp() for item in items), dtype=np.float64, count=count)
+    timed = np.fromiter((not item.is_all_day for item in items), dtype=bool, count=count)
+    durations = np.fromiter(((item.end - item.start) // MICROSECOND for item in items), 
+                            dtype=np.int64, count=count)
+    spans = durations // DAY_MICROSECONDS
+
+    # Timed items up to 3 hours grow by one base height per started 30 minutes
+    heights = np.where(
+        timed & (durations <= THREE_HOURS_MICROSECONDS),
+        TASK_HEIGHT * (durations // HALF_HOUR_MICROSECONDS + 1),
+        TASK_HEIGHT
+    )
+
+    # Expand multi-day items into one row per covered day within the week
+    first = np.maximum(start_idx, 0)
+    last = np.minimum(start_idx + spans, 6)
+    day_counts = np.clip(last - first + 1, 0, None)
+    rows = np.repeat(np.arange(count), day_counts)
+    offsets = np.arange(rows.size) - np.repeat(np.cumsum(day_counts) - day_counts, day_counts)
+    day_idx = np.repeat(first, day_counts) + offsets
+
+    # Sort rows by day, all-day first, then start time
+    order = np.lexsort((start_ts[rows], timed[rows], day_idx))
+    rows = rows[order]
+    day_idx = day_idx[order]
+    row_heights = heights[rows]
+
+    # Stack boxes within each day: offset by the heights above, reset per day
+    steps = row_heights + PADDING
+    stacked = np.cumsum(steps) - steps
+    day_first_row = np.searchsorted(day_idx, day_idx)
+    ys = HEADER_HEIGHT + PADDING + stacked - stacked[day_first_row]
+    xs = x_offset + day_idx * day_width
+
+    return list(zip(
+        [items[row] for row in rows.tolist()], xs.tolist(), ys.tolist(), row_heights.tolist()
+    ))
 
 def calculate_calendar_dimensions(display_width: int, display_height: int, 
                                 width_ratio: float) -> Tuple[int, int, int, int]:
@@ -1,218 +1,277 @@
 """Calendar rendering and drawing functionality."""
 
 from PIL import Image, ImageDraw, ImageFont
-from datetime import datetime, timedelta
+from datetime import datetime, time
 from typing import List, Dict, Any, Optional, Tuple, Union
+from functools import lru_cache
 import logging
-import textwrap
 
 from .styles import (
     HEADER_HEIGHT, TASK_HEIGHT, PADDING, TASK_PADDING,
     DEFAULT_FONT_SIZE, DEFAULT_TASK_FONT_SIZE,
     TIMESTAMP_FONT_SIZE, MAX_TITLE_LENGTH, MAX_TIMED_TITLE_LENGTH,
-    LINE_HEIGHT, FONT_PATH
+    LINE_HEIGHT, FONT_PATH, get_font, BLACK, WHITE, GRAY, YELLOW,
+    HEADER_COLOR, TODAY_HEADER_COLOR, GRID_COLOR
+)
+from .layout import (
+    DayColumn, RenderContext, layout_calendar_items, truncate_title
 )
-from .layout import calculate_week_start, calculate_day_index, calculate_item_height
 from ..services.google_calendar import CalendarEvent
 from ..services.ticktick import TickTickTask
 
 logger = logging.getLogger(__name__)
 
+MAX_WORD_CACHE_SIZE = 4096
+MAX_WRAP_CACHE_SIZE = 512
+
+@lru_cache(maxsize=64)
+def _item_tile(color: Tuple[int, int, int], width: int, height: int) -> Image.Image:
+    """Pre-rasterize an outlined item background so repeated items are pasted."""
+    tile = Image.new('RGB', (width, height), color)
+    ImageDraw.Draw(tile).rectangle([0, 0, width - 1, height - 1], outline=BLACK)
+    return tile
+
+@lru_cache(maxsize=512)
+def _display_title(title: str, start: Optional[Tuple[int, int]]) -> str:
+    """Build an item's display title, memoized since items are refetched every render."""
+    if start is None:
+        return truncate_title(title, MAX_TITLE_LENGTH)
+    time_str = time(*start).strftime('%-I:%M %p')
+    return f"{time_str} {truncate_title(title, MAX_TIMED_TITLE_LENGTH)}"
+
 class CalendarRenderer:
     """Handles the rendering of calendar elements."""
 
-    FONT_NAME = "DejaVuSans.ttf"  # No longer used, use FONT_PATH instead
+    # Colors that should use black font
+    LIGHT_COLORS = {YELLOW}
 
     def __init__(self):
         """Initialize the calendar renderer."""
         self.header_font = None
         self.task_font = None
         self.timestamp_font = None
+        self._header_masks: Dict[str, Tuple[int, int, Image.Image]] = {}
+        self._word_widths: Dict[str, float] = {}
+        self._wrapped_titles: Dict[Tuple[str, int], Tuple[str, ...]] = {}
         self._load_fonts()
 
     def _load_fonts(self) -> None:
         """Load fonts for calendar display with fallback to default."""
-        try:
-            self.header_font = ImageFont.truetype(FONT_PATH, DEFAULT_FONT_SIZE)
-            self.task_font = ImageFont.truetype(FONT_PATH, DEFAULT_TASK_FONT_SIZE)
-            self.timestamp_font = ImageFont.truetype(FONT_PATH, TIMESTAMP_FONT_SIZE)
-        except Exception as e:
-            logger.warning(f"Failed to load custom fonts: {e}. Using default fonts.")
+        # Cached measurements belong to the previous fonts
+        self._word_widths.clear()
+        self._wrapped_titles.clear()
+        self.header_font = get_font(FONT_PATH, DEFAULT_FONT_SIZE)
+        self.task_font = get_font(FONT_PATH, DEFAULT_TASK_FONT_SIZE)
+        self.timestamp_font = get_font(FONT_PATH, TIMESTAMP_FONT_SIZE)
+        if not (self.header_font and self.task_font and self.timestamp_font):
+            logger.warning("Failed to load custom fonts. Using default fonts.")
             self.header_font = None
             self.task_font = None
             self.timestamp_font = None
 
-    def draw_calendar_structure(self, draw: ImageDraw.Draw, x_offset: int, day_width: int, 
-                              height: int) -> None:
+    def draw_calendar_structure(self, image: Image.Image, draw: ImageDraw.Draw, 
+                              days: List[DayColumn], day_width: int, height: int) -> None:
         """Draw the basic calendar structure including headers and grid lines."""
-        today = datetime.now()
-        week_start = calculate_week_start()
+
+        # Bind the per-call methods once; the loops below issue 7 headers and 8 lines
+        rectangle = draw.rectangle
+        paste_text = self.paste_header_text
+        paste = image.paste
 
         # Draw day headers
-        for i in range(7):
-            x = x_offset + i * day_width
-            date = week_start + timedelta(days=i)
-            day_name = date.strftime('%a')
-            day_num = date.strftime('%d')
+        for day in days:
+            x = day.x
             
             # Use gray background for current day
-            is_today = date.date() == today.date()
-            header_color = '#666666' if is_today else '#f7f7f7'
-            text_color = 'white' if is_today else 'black'
+            header_color = TODAY_HEADER_COLOR if day.is_today else HEADER_COLOR
+            text_color = WHITE if day.is_today else BLACK
             
-            draw.rectangle([x, 0, x + day_width, HEADER_HEIGHT], 
-                         outline='black', fill=header_color)
-            draw.text((x + PADDING, PADDING), day_name, 
-                     fill=text_color, font=self.header_font)
-            draw.text((x + PADDING, PADDING + 25), day_num, 
-                     fill=text_color, font=self.header_font)
-
-        # Draw vertical grid lines
-        for i in range(8):
-            x = x_offset + i * day_width
-            draw.line([x, HEADER_HEIGHT, x, height], 
-                     fill='#cccccc', width=1)
-
-    def draw_calendar_items(self, draw: ImageDraw.Draw, 
+            rectangle([x, 0, x + day_width, HEADER_HEIGHT], 
+                      outline=BLACK, fill=header_color)
+            paste_text(image, draw, (x + PADDING, PADDING), day.name, text_color)
+            paste_text(image, draw, (x + PADDING, PADDING + 25), day.number, text_color)
+
+        # Fill the 1px vertical grid lines directly rather than rasterizing lines
+        for x in [day.x for day in days] + [days[-1].x + day_width]:
+            paste(GRID_COLOR, (x, HEADER_HEIGHT, x + 1, height + 1))
+
+    def paste_header_text(self, image: Image.Image, draw: ImageDraw.Draw, 
+                          xy: Tuple[int, int], text: str, 
+                          color: Tuple[int, int, int]) -> None:
+        """Paste header text through a cached glyph mask instead of re-rasterizing it."""
+        cached = self._header_masks.get(text)
+        if cached is None:
+            left, top, right, bottom = draw.textbbox((0, 0), text, font=self.header_font)
+            mask = Image.new('L', (right - left, bottom - top), 0)
+            ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=self.header_font)
+            cached = self._header_masks[text] = (left, top, mask)
+
+        left, top, mask = cached
+        x, y = xy[0] + left, xy[1] + top
+        image.paste(color, (x, y, x + mask.width, y + mask.height), mask)
+
+    def draw_calendar_items(self, image: Image.Image, draw: ImageDraw.Draw, 
                           items: List[Union[CalendarEvent, TickTickTask]], 
-                          x_offset: int, day_width: int) -> None:
+                          x_offset: int, day_width: int, ctx: RenderContext) -> None:
         """Draw tasks and events on the calendar."""
-        week_start = calculate_week_start()
-
-        # Organize items by day
-        items_by_day: List[List[Union[CalendarEvent, TickTickTask]]] = [[] for _ in range(7)]
-        for item in items:
-            # Handle multi-day events
-            current_date = item.start
-            while current_date <= item.end and current_date.date() <= (week_start + timedelta(days=6)).date():
-                day_idx = calculate_day_index(current_date, week_start)
-                if 0 <= day_idx < 7:
-                    items_by_day[day_idx].append(item)
-                current_date += timedelta(days=1)
-
-        # Sort and draw items for each day
-        for day_idx, day_items in enumerate(items_by_day):
-            # Sort by all-day first, then by start time
-            day_items.sort(key=lambda x: (not x.is_all_day, x.start))
-            self.draw_day_items(draw, day_idx, day_items, x_offset, day_width)
-
-    def calculate_item_height(self, item: Union[CalendarEvent, TickTickTask], base_height: int) -> int:
-        """Calculate the height of an item based on its duration."""
+
+        # Resolve colors and display titles once, multi-day items are drawn on several days
+        item_styles: Dict[int, Tuple[Tuple[int, int, int], str]] = {
+            id(item): (self.get_item_color(item), self.get_display_title(item))
+            for item in items
+        }
+
+        # Bind hot-loop lookups to locals, every column shares the same wrap width
+        draw_item = self.draw_item
+        text_width = self.get_text_width(day_width)
+
+        # Layout math is vectorized, this loop only issues the drawing calls
+        for item, x, y, height in layout_calendar_items(items, ctx.week_start_ord, x_offset, day_width):
+            color, title = item_styles[id(item)]
+            draw_item(image, draw, item, x, y, day_width, color, title, height, text_width)
+
+    def get_display_title(self, item: Union[CalendarEvent, TickTickTask]) -> str:
+        """Get the truncated title to draw, prefixed with the start time for timed items."""
         if item.is_all_day:
-            return base_height
-            
-        duration = item.end - item.start
-        duration_hours = duration.total_seconds() / 3600
-        
-        if duration_hours <= 3:
-            # For events under 3 hours, increase height for every 30 minutes
-            # Each 30-minute increment adds one base_height
-            thirty_min_blocks = int(duration_hours * 2)  # Convert hours to 30-min blocks
-            return base_height * (thirty_min_blocks + 1)  # +1 for minimum height
-        else:
-            # For longer events, use standard height
-            return base_height
-
-    def draw_day_items(self, draw: ImageDraw.Draw, day_idx: int, 
-                      day_items: List[Union[CalendarEvent, TickTickTask]], 
-                      x_offset: int, day_width: int) -> None:
-        """Draw items for a specific day."""
-        x = x_offset + day_idx * day_width
-        y = HEADER_HEIGHT + PADDING
-
-        # Draw all-day items first
-        all_day_items = [i for i in day_items if i.is_all_day]
-        for item in all_day_items:
-            color = self.get_item_color(item)
-            self.draw_item(draw, item, x, y, day_width, color)
-            y += TASK_HEIGHT + PADDING
-
-        # Draw timed items
-        timed_items = [i for i in day_items if not i.is_all_day]
-        for item in timed_items:
-            color = self.get_item_color(item)
-            time_str = item.start.strftime('%-I:%M %p')
-            title = f"{time_str} {item.title[:MAX_TIMED_TITLE_LENGTH]}"
-            item_height = self.calculate_item_height(item, TASK_HEIGHT)
-            self.draw_item(draw, item, x, y, day_width, color, title, item_height)
-            y += item_height + PADDING
-
-    def get_font_color(self, background_color: str) -> str:
+            return _display_title(item.title, None)
+        return _display_title(item.title, (item.start.hour, item.start.minute))
+
+    def get_font_color(self, background_color: Tuple[int, int, int]) -> Tuple[int, int, int]:
         """Determine the appropriate font color based on the background color.
         
         Args:
-            background_color: The hex color code of the background
+            background_color: The RGB color of the background
             
         Returns:
-            'black' for light backgrounds, 'white' for dark backgrounds
+            BLACK for light backgrounds, WHITE for dark backgrounds
         """
-        # Colors that should use black font
-        light_colors = {
-            'yellow',
-        }
-        
-        return 'black' if background_color.lower() in light_colors else 'white'
+        return BLACK if background_color in self.LIGHT_COLORS else WHITE
+
+    def get_text_width(self, day_width: int) -> int:
+        """Get the pixel width available for item text, or 0 to disable wrapping."""
+        if not self.task_font:
+            # Fallback if font loading fails
+            return 0
+
+        return max(0, day_width - (2 * PADDING + 2 * TASK_PADDING))
 
-    def draw_item(self, draw: ImageDraw.Draw, 
+    def _measure(self, text: str) -> float:
+        """Measure text with the task font, caching widths since words recur every render."""
+        width = self._word_widths.get(text)
+        if width is None:
+            if len(self._word_widths) >= MAX_WORD_CACHE_SIZE:
+                self._word_widths.clear()
+            width = self._word_widths[text] = self.task_font.getlength(text)
+        return width
+
+    def wrap_title(self, title: str, text_width: int) -> Tuple[str, ...]:
+        """
+        Greedily wrap a title into lines that fit the given pixel width.
+
+        Words wider than a whole line are split between characters, like
+        textwrap does, so text never runs past the item box.
+
+        Args:
+            title: Title to wrap
+            text_width: Available width in pixels
+
+        Returns:
+            Wrapped lines
+        """
+        key = (title, text_width)
+        wrapped = self._wrapped_titles.get(key)
+        if wrapped is not None:
+            return wrapped
+
+        measure = self._measure
+        space_width = measure(' ')
+        lines: List[str] = []
+        line: List[str] = []
+        line_width = 0.0
+        for word in title.split():
+            word_width = measure(word)
+
+            # Split words that can never fit, filling the current line first
+            while word_width > text_width:
+                available = text_width - line_width - (space_width if line else 0)
+                cut = 0
+                while measure(word[:cut + 1]) <= available:
+                    cut += 1
+                if not cut and not line:
+                    # Not even one character fits, place it anyway
+                    cut = 1
+                if cut:
+                    line.append(word[:cut])
+                    word = word[cut:]
+                    word_width = measure(word)
+                lines.append(' '.join(line))
+                line, line_width = [], 0.0
+            if not word:
+                continue
+
+            if line and line_width + space_width + word_width > text_width:
+                lines.append(' '.join(line))
+                line, line_width = [], 0.0
+            line_width += word_width + (space_width if line else 0)
+            line.append(word)
+        if line:
+            lines.append(' '.join(line))
+
+        if len(self._wrapped_titles) >= MAX_WRAP_CACHE_SIZE:
+            self._wrapped_titles.clear()
+        wrapped = self._wrapped_titles[key] = tuple(lines)
+        return wrapped
+
+    def draw_item(self, image: Image.Image, draw: ImageDraw.Draw, 
                  item: Union[CalendarEvent, TickTickTask], 
-                 x: int, y: int, day_width: int, color: str, 
-                 title: Optional[str] = None, height: Optional[int] = None) -> None:
+                 x: int, y: int, day_width: int, color: Tuple[int, int, int], 
+                 title: Optional[str] = None, height: Optional[int] = None, 
+                 text_width: Optional[int] = None) -> None:
         """Draw a single calendar item with text wrapping."""
         if title is None:
-            title = item.title[:MAX_TITLE_LENGTH]
+            title = truncate_title(item.title, MAX_TITLE_LENGTH)
             
         if height is None:
             height = TASK_HEIGHT
-            
-        # Calculate available width for text
-        text_width = day_width - (2 * PADDING + 2 * TASK_PADDING)
+
+        if text_width is None:
+            text_width = self.get_text_width(day_width)
         
         # Wrap text to fit available width
-        if self.task_font:
-            # Estimate characters per line based on font size
-            chars_per_line = int(text_width / (DEFAULT_TASK_FONT_SIZE * 0.6))  # Approximate character width
-            wrapped_text = textwrap.wrap(title, width=chars_per_line)
-        else:
-            # Fallback if font loading fails
-            wrapped_text = [title]
+        wrapped_text = self.wrap_title(title, text_width) if text_width else (title,)
             
         # Calculate required height based on number of lines
         required_height = max(height, len(wrapped_text) * LINE_HEIGHT)
         
-        # Draw the background rectangle
-        draw.rectangle([x + TASK_PADDING, y, 
-                       x + day_width - TASK_PADDING, 
-                       y + required_height], 
-                      fill=color, outline='black')
+        # Paste the cached background tile, matching the inclusive rectangle bounds
+        tile = _item_tile(color, day_width - 2 * TASK_PADDING + 1, required_height + 1)
+        image.paste(tile, (x + TASK_PADDING, y))
         
         # Draw wrapped text
         font_color = self.get_font_color(color)
+        text, font = draw.text, self.task_font
+        text_x = x + PADDING
         current_y = y + PADDING
         for line in wrapped_text:
-            draw.text((x + PADDING, current_y), 
-                     line, fill=font_color, font=self.task_font)
+            text((text_x, current_y), line, fill=font_color, font=font)
             current_y += LINE_HEIGHT
 
-    def get_item_color(self, item: Union[CalendarEvent, TickTickTask]) -> str:
+    def get_item_color(self, item: Union[CalendarEvent, TickTickTask]) -> Tuple[int, int, int]:
         """Get the appropriate color for an item based on its source and status."""
         if isinstance(item, TickTickTask):
-            return 'gray' if item.completed else item.color
+            return GRAY if item.completed else item.color
         return item.color
 
-    def draw_timestamp(self, draw: ImageDraw.Draw, width: int, height: int) -> None:
-        """Draw the current timestamp at the bottom right of the image."""
-        timestamp = datetime.now().strftime("%b %d - %I:%M %p")
-        
-        # Calculate text size to position it properly
+    def draw_timestamp(self, draw: ImageDraw.Draw, width: int, height: int, 
+                       now: datetime) -> None:
+        """Draw the render timestamp at the bottom right of the image."""
+        timestamp = now.strftime("%b %d - %I:%M %p")
+        x = width - 70
+        y = height - 25
+
+        # Right-align via the anchor so Pillow measures the text in the same layout pass
         if self.timestamp_font:
-            text_width = self.timestamp_font.getlength(timestamp)
+            draw.text((x, y), timestamp, fill=BLACK, font=self.timestamp_font, anchor='ra')
         else:
             # Approximate width if font loading fails
-            text_width = len(timestamp) * 8
-
-        # Position the timestamp at the bottom right
-        x = width - text_width - 70
-        y = height - 25
-
-        # Draw the timestamp
-        draw.text((x, y), timestamp, fill='black', font=self.timestamp_font) 
+            draw.text((x - len(timestamp) * 8, y), timestamp, fill=BLACK)
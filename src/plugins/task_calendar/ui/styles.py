@@ -1,8 +1,21 @@
 """Calendar styling and visual constants."""
 
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import logging
 from PIL import ImageFont
 
+logger = logging.getLogger(__name__)
+
+# Colors as RGB tuples so Pillow does not parse color strings on every draw
+BLACK: Tuple[int, int, int] = (0, 0, 0)
+WHITE: Tuple[int, int, int] = (255, 255, 255)
+GRAY: Tuple[int, int, int] = (128, 128, 128)
+YELLOW: Tuple[int, int, int] = (255, 255, 0)
+HEADER_COLOR: Tuple[int, int, int] = (0xF7, 0xF7, 0xF7)
+TODAY_HEADER_COLOR: Tuple[int, int, int] = (0x66, 0x66, 0x66)
+GRID_COLOR: Tuple[int, int, int] = (0xCC, 0xCC, 0xCC)
+
 # Layout constants
 HEADER_HEIGHT: int = 80  # Keep as before
 TASK_HEIGHT: int = 40    # Keep as before
@@ -20,4 +33,25 @@ TIMESTAMP_FONT_SIZE: int = 10    # Doubled from 20
 MAX_TITLE_LENGTH: int = 25       # Increased from 25
 MAX_TIMED_TITLE_LENGTH: int = 20 # Increased from 20 
 
-FONT_PATH = ImageFont.truetype("DejaVuSans.ttf", size=10).path
+# Resolved by Pillow's font search when the fonts are loaded, not at import
+FONT_PATH: str = "DejaVuSans.ttf"
+
+@lru_cache(maxsize=32)
+def get_font(path: str, size: int) -> Optional[ImageFont.FreeTypeFont]:
+    """
+    Load a font once per process and share it between all renderers.
+
+    Failed loads are cached as None so the font search is not repeated.
+
+    Args:
+        path: Font file path or name to search for
+        size: Font size in points
+
+    Returns:
+        The loaded font, or None if it is unavailable
+    """
+    try:
+        return ImageFont.truetype(path, size)
+    except OSError as e:
+        logger.warning(f"Failed to load font {path} at size {size}: {e}")
+        return None